@@ -0,0 +1,14 @@
+"""
+Definition of the application configuration.
+"""
+
+from django.apps import AppConfig
+
+
+class PrintersConfig(AppConfig):
+    name = 'app'
+    default_auto_field = 'django.db.models.AutoField'
+
+    def ready(self):
+        # Connects the signal handlers keeping the cached reports up to date
+        from . import reports  # noqa: F401
@@ -0,0 +1,56 @@
+"""
+Measures the bytes sent for the home page with a seeded inventory of printers.
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+
+from app.middleware import brotli
+from app.models import Printer
+
+SEED_BATCH_SIZE = 1000
+
+def seed_printers(count):
+    """Bulk inserts count printers with realistic, mostly distinct values."""
+    Printer.objects.bulk_create(
+        (Printer(
+            brand=f"Brand {index % 40}",
+            model=f"Model {index % 300}",
+            location=f"Building {index % 25} Floor {index % 6}",
+            ip_address=f"10.{index // 65536}.{(index // 256) % 256}.{index % 256}",
+            mac_address=f"00:1A:2B:{index // 65536:02X}:{(index // 256) % 256:02X}:{index % 256:02X}",
+            manufacture_date=f"{2010 + index % 15}-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+            comments="Routine service due",
+        ) for index in range(count)),
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+class Command(BaseCommand):
+    help = "Measures the bytes sent for the home page with a seeded inventory of printers. Nothing is kept."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--printers', type=int, default=10000, help="Number of printers to seed.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            seed_printers(options['printers'])
+            user = User.objects.create_user(username='bench-home-page')
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+
+            self.stdout.write(f"GET / with {options['printers']:,} seeded printers, body bytes:")
+            encodings = [('uncompressed', ''), ('gzip', 'gzip')]
+            if brotli is not None:
+                encodings.append(('brotli', 'gzip, br'))
+            else:
+                self.stdout.write("  (brotli is not installed, skipping it)")
+            for label, accept_encoding in encodings:
+                response = client.get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+                self.stdout.write(f"  {label:<20}{len(response.content):>14,}")
+
+            response = client.get('/', HTTP_IF_NONE_MATCH=response['ETag'])
+            self.stdout.write(f"  {f'{response.status_code} revalidation':<20}{len(response.content):>14,}")
+
+            transaction.set_rollback(True)
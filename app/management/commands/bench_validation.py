@@ -0,0 +1,66 @@
+"""
+Times printer validation on generated rows, the original inline checks against clean_printers.
+"""
+
+import time
+
+from dateutil import parser
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.core.validators import validate_ipv46_address
+
+from app.validators import REQUIRED_FIELDS, clean_printers
+
+# One row in INVALID_EVERY has a bad IP address, so the error paths are timed too.
+INVALID_EVERY = 20
+
+def generate_rows(count):
+    """Returns count printer rows shaped like submitted forms, mostly valid."""
+    return [
+        {
+            'brand': f"Brand {index % 40}",
+            'model': f"Model {index % 300}",
+            'location': f"Building {index % 25} Floor {index % 6}",
+            'ip_address': f"10.{index // 65536}.{(index // 256) % 256}.{index % 256}" if index % INVALID_EVERY else "10.0.0.256",
+            'mac_address': f"00:1A:2B:{index // 65536:02X}:{(index // 256) % 256:02X}:{index % 256:02X}",
+            'manufacture_date': f"{2010 + index % 15}-{index % 12 + 1:02d}-{index % 28 + 1:02d}",
+            'comments': "Routine service due",
+        }
+        for index in range(count)
+    ]
+
+def inline_validation(rows):
+    """The checks add_printer and update_printer made before clean_printer existed."""
+    errors = 0
+    for row in rows:
+        if any(not row.get(field) or row.get(field).strip() == '' for field in REQUIRED_FIELDS):
+            errors += 1
+            continue
+        try:
+            validate_ipv46_address(row['ip_address'])
+        except ValidationError:
+            errors += 1
+            continue
+        try:
+            parser.parse(row['manufacture_date']).date().strftime('%Y-%m-%d')
+        except (ValueError, TypeError):
+            errors += 1
+    return errors
+
+def batch_validation(rows):
+    return len(clean_printers(rows)[1])
+
+class Command(BaseCommand):
+    help = "Times printer validation on generated rows, the original inline checks against clean_printers."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help="Number of rows to validate.")
+
+    def handle(self, *args, **options):
+        rows = generate_rows(options['rows'])
+        self.stdout.write(f"Validating {len(rows):,} rows:")
+        for label, validate in [('inline checks', inline_validation), ('clean_printers', batch_validation)]:
+            start = time.perf_counter()
+            errors = validate(rows)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"  {label:<20}{elapsed:>10.3f}s{len(rows) / elapsed:>14,.0f} rows/s{errors:>8,} rejected")
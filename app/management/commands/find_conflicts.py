@@ -0,0 +1,67 @@
+"""
+Reports printers sharing an IP address, a MAC address or a subnet.
+"""
+
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from app.models import PLACEHOLDER_IP, PLACEHOLDER_MAC, PLACEHOLDER_SUBNET, Printer
+
+# Columns to group by, the heading used in the report and the value standing for an unknown address
+CONFLICT_COLUMNS = [
+    ('ip_normalized', 'Duplicate IP addresses', PLACEHOLDER_IP),
+    ('mac_normalized', 'Duplicate MAC addresses', PLACEHOLDER_MAC),
+    ('ip_subnet', 'Printers in the same subnet', PLACEHOLDER_SUBNET),
+]
+
+REFRESH_BATCH_SIZE = 1000
+
+class Command(BaseCommand):
+    help = "Reports printers sharing an IP address, a MAC address or a subnet."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refresh', action='store_true',
+                            help="Recompute the normalized address columns of every printer before reporting.")
+
+    def handle(self, *args, **options):
+        if options['refresh']:
+            self.refresh()
+
+        for column, heading, placeholder in CONFLICT_COLUMNS:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{heading}:"))
+            found = False
+            for key, printers in groupby(self.shared(column, placeholder), key=lambda printer: getattr(printer, column)):
+                found = True
+                self.stdout.write(f"  {key}")
+                for printer in printers:
+                    self.stdout.write(f"    #{printer.id} {printer} ({printer.ip_address}, {printer.mac_address})")
+            if not found:
+                self.stdout.write("  None")
+
+    def shared(self, column, placeholder):
+        """Returns the printers whose column value is used more than once, ordered by that value.
+        Empty and placeholder values are left out. The grouping runs as a subquery, so each report
+        is a single query."""
+        shared_values = (Printer.objects.exclude(**{f'{column}__in': ['', placeholder]})
+                         .values(column)
+                         .annotate(count=Count('id'))
+                         .filter(count__gt=1)
+                         .values(column))
+        return (Printer.objects.filter(**{f'{column}__in': shared_values})
+                .only('id', 'brand', 'model', 'location', 'ip_address', 'mac_address', column)
+                .order_by(column, 'id'))
+
+    def refresh(self):
+        """Recomputes the normalized columns, e.g. for rows saved before they existed."""
+        fields = ['ip_normalized', 'mac_normalized', 'ip_subnet']
+        batch = []
+        for printer in Printer.objects.only('id', 'ip_address', 'mac_address').iterator(chunk_size=REFRESH_BATCH_SIZE):
+            printer.normalize_addresses()
+            batch.append(printer)
+            if len(batch) == REFRESH_BATCH_SIZE:
+                Printer.objects.bulk_update(batch, fields)
+                batch = []
+        if batch:
+            Printer.objects.bulk_update(batch, fields)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrinterChanges',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('changes', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:08
+
+import ipaddress
+import re
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# Copies of the helpers in app.models as they were when this migration was
+# written, so later changes to them don't change what this migration does.
+IPV4_SUBNET_PREFIX = 24
+IPV6_SUBNET_PREFIX = 64
+
+re_not_hex = re.compile(r'[^0-9a-f]')
+
+
+def normalize_ip(value):
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except ValueError:
+        return ''
+
+
+def normalize_mac(value):
+    digits = re_not_hex.sub('', value.lower())
+    return digits if len(digits) == 12 else ''
+
+
+def ip_subnet(value):
+    try:
+        ip = ipaddress.ip_address(value.strip())
+    except ValueError:
+        return ''
+    prefix = IPV4_SUBNET_PREFIX if ip.version == 4 else IPV6_SUBNET_PREFIX
+    return str(ipaddress.ip_network((ip, prefix), strict=False))
+
+
+def fill_normalized_addresses(apps, schema_editor):
+    Printer = apps.get_model('app', 'Printer')
+    batch = []
+    for printer in Printer.objects.only('id', 'ip_address', 'mac_address').iterator(chunk_size=BATCH_SIZE):
+        printer.ip_normalized = normalize_ip(printer.ip_address)
+        printer.mac_normalized = normalize_mac(printer.mac_address)
+        printer.ip_subnet = ip_subnet(printer.ip_address)
+        batch.append(printer)
+        if len(batch) == BATCH_SIZE:
+            Printer.objects.bulk_update(batch, ['ip_normalized', 'mac_normalized', 'ip_subnet'])
+            batch = []
+    if batch:
+        Printer.objects.bulk_update(batch, ['ip_normalized', 'mac_normalized', 'ip_subnet'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_printerchanges'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='printer',
+            name='ip_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='printer',
+            name='ip_subnet',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=49),
+        ),
+        migrations.AddField(
+            model_name='printer',
+            name='mac_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=17),
+        ),
+        migrations.RunPython(fill_normalized_addresses, migrations.RunPython.noop),
+    ]
@@ -2,7 +2,47 @@
 Definition of models.
 """
 
-from django.db import models
+import ipaddress
+import re
+
+from django.db import models, transaction
+from django.db.models import F, Max, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Prefix lengths used to group printers into subnets for conflict reports
+IPV4_SUBNET_PREFIX = 24
+IPV6_SUBNET_PREFIX = 64
+
+# Normalized forms of the model's default addresses, which mean "unknown" rather than a real address
+PLACEHOLDER_IP = '0.0.0.0'
+PLACEHOLDER_MAC = '000000000000'
+PLACEHOLDER_SUBNET = '0.0.0.0/24'
+PLACEHOLDER_DATE = '1900-00-00'
+
+re_not_hex = re.compile(r'[^0-9a-f]')
+
+def normalize_ip(value):
+    """Returns the canonical form of an IP address, or an empty string if it doesn't parse."""
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except ValueError:
+        return ''
+
+def normalize_mac(value):
+    """Returns a MAC address as 12 lowercase hex digits, whatever separators were used,
+    or an empty string if it isn't one (e.g. free text such as 'N/A')."""
+    digits = re_not_hex.sub('', value.lower())
+    return digits if len(digits) == 12 else ''
+
+def ip_subnet(value):
+    """Returns the subnet an IP address belongs to, or an empty string if it doesn't parse."""
+    try:
+        ip = ipaddress.ip_address(value.strip())
+    except ValueError:
+        return ''
+    prefix = IPV4_SUBNET_PREFIX if ip.version == 4 else IPV6_SUBNET_PREFIX
+    return str(ipaddress.ip_network((ip, prefix), strict=False))
 
 class Printer(models.Model):
     id = models.AutoField(primary_key=True)
@@ -13,9 +53,53 @@ class Printer(models.Model):
     mac_address = models.CharField(max_length=17, blank=False, null=False, default="00:00:00:00:00:00")  # MAC addresses are typically 17 characters long
     manufacture_date = models.CharField(max_length=100, blank=False, null=False, default="1900-00-00")
     comments = models.TextField(blank=True, null=True, default="Comments")
+    # Normalized copies of the addresses, kept in sync by save() for indexed conflict lookups
+    ip_normalized = models.CharField(blank=True, null=False, default="", editable=False, db_index=True)
+    mac_normalized = models.CharField(max_length=17, blank=True, null=False, default="", editable=False, db_index=True)
+    ip_subnet = models.CharField(max_length=49, blank=True, null=False, default="", editable=False, db_index=True)
 
     def __str__(self):
         return f"{self.brand} {self.model} - {self.location}"
+
+    def save(self, *args, **kwargs):
+        self.normalize_addresses()
+        # post_save bumps PrinterChanges, keep both writes in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
+    def normalize_addresses(self):
+        self.ip_normalized = normalize_ip(self.ip_address)
+        self.mac_normalized = normalize_mac(self.mac_address)
+        self.ip_subnet = ip_subnet(self.ip_address)
+
+    @classmethod
+    def address_conflicts(cls, ip_address, mac_address, exclude_id=None):
+        """Returns the printers already using the IP or MAC address, in a single indexed lookup.
+        Empty and placeholder addresses never conflict."""
+        lookup = Q()
+        ip_normalized = normalize_ip(ip_address)
+        if ip_normalized and ip_normalized != PLACEHOLDER_IP:
+            lookup |= Q(ip_normalized=ip_normalized)
+        mac_normalized = normalize_mac(mac_address)
+        if mac_normalized and mac_normalized != PLACEHOLDER_MAC:
+            lookup |= Q(mac_normalized=mac_normalized)
+        if not lookup:
+            return cls.objects.none()
+        conflicts = cls.objects.filter(lookup)
+        if exclude_id is not None:
+            conflicts = conflicts.exclude(pk=exclude_id)
+        return conflicts
+
+    @classmethod
+    def table_version(cls):
+        """Returns a cheap key that changes whenever a printer is added, edited or deleted.
+        Both parts are single-row lookups, the max id comes straight from the primary key index."""
+        max_id = cls.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        return f"{max_id}.{PrinterChanges.current()}"
     
     def editPrinter(self, id, brand, model, location, ip_address, mac_address, manufacture_date, comments):
         printer = Printer.objects.get(id=id)
@@ -28,3 +112,24 @@ class Printer(models.Model):
         printer.comments = comments
         printer.save()
         return printer
+
+class PrinterChanges(models.Model):
+    """Single row counting every save and delete of a printer, feeds the home page ETag.
+    Printer.save and delete, like QuerySet.delete, run the write and the bump in one
+    transaction, so either both are committed or neither is."""
+    id = models.AutoField(primary_key=True)
+    changes = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).values_list('changes', flat=True).first() or 0
+
+    @classmethod
+    def bump(cls):
+        if not cls.objects.filter(pk=1).update(changes=F('changes') + 1):
+            cls.objects.get_or_create(pk=1, defaults={'changes': 1})
+
+@receiver(post_save, sender=Printer)
+@receiver(post_delete, sender=Printer)
+def count_printer_change(sender, **kwargs):
+    PrinterChanges.bump()
@@ -0,0 +1,134 @@
+"""
+Fleet statistics for the reports page.
+
+Each report counts printers by one key in a single GROUP BY query. The results
+are cached for the day and kept up to date by the Printer signal handlers below,
+which adjust the cached counts once the change is committed instead of recomputing them.
+"""
+
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, Q, Value, When
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import PLACEHOLDER_DATE, Printer
+from .validators import ISO_DATE_PATTERN, re_iso_date
+
+REPORTS = ('brand', 'model', 'location', 'age_band')
+
+# (maximum age in years, label), youngest first
+AGE_BANDS = [
+    (1, 'Under 1 year'),
+    (3, '1-3 years'),
+    (5, '3-5 years'),
+    (10, '5-10 years'),
+]
+OLDEST_AGE_BAND = '10+ years'
+UNKNOWN_AGE_BAND = 'Unknown'
+
+def years_ago(today, years):
+    """Returns the date the given number of years before today as YYYY-MM-DD."""
+    try:
+        return today.replace(year=today.year - years).isoformat()
+    except ValueError:  # 29 February
+        return today.replace(year=today.year - years, day=28).isoformat()
+
+def age_band_expression(today):
+    """Database expression for the age band of a printer.
+    Dates are stored as YYYY-MM-DD strings, so they can be compared as strings without casting."""
+    whens = [
+        When(manufacture_date=PLACEHOLDER_DATE, then=Value(UNKNOWN_AGE_BAND)),
+        When(~Q(manufacture_date__regex=f'^{ISO_DATE_PATTERN}$'), then=Value(UNKNOWN_AGE_BAND)),
+    ]
+    whens += [When(manufacture_date__gt=years_ago(today, years), then=Value(label)) for years, label in AGE_BANDS]
+    return Case(*whens, default=Value(OLDEST_AGE_BAND))
+
+def age_band(manufacture_date, today):
+    """Python equivalent of age_band_expression, for a single printer."""
+    if not manufacture_date or manufacture_date == PLACEHOLDER_DATE or not re_iso_date.fullmatch(manufacture_date):
+        return UNKNOWN_AGE_BAND
+    for years, label in AGE_BANDS:
+        if manufacture_date > years_ago(today, years):
+            return label
+    return OLDEST_AGE_BAND
+
+def compute_reports(today):
+    """Counts printers by brand, model, location and age band, one grouped query per report."""
+    printers = Printer.objects.order_by()
+    grouped = {
+        'brand': printers.values('brand'),
+        'model': printers.values('model'),
+        'location': printers.values('location'),
+        'age_band': printers.annotate(age_band=age_band_expression(today)).values('age_band'),
+    }
+    return {
+        name: dict(query.annotate(count=Count('id')).values_list(name, 'count'))
+        for name, query in grouped.items()
+    }
+
+def reports_cache_key(today):
+    # Age bands move with the calendar, so each day gets fresh reports.
+    return f'printer-reports-{today.isoformat()}'
+
+def get_reports():
+    """Returns the fleet reports, from the cache when possible."""
+    today = date.today()
+    key = reports_cache_key(today)
+    reports = cache.get(key)
+    if reports is None:
+        reports = compute_reports(today)
+        cache.set(key, reports, settings.REPORTS_CACHE_TIMEOUT)
+    return reports
+
+def report_keys(printer, today):
+    return {
+        'brand': printer.brand,
+        'model': printer.model,
+        'location': printer.location,
+        'age_band': age_band(printer.manufacture_date, today),
+    }
+
+def update_reports(today, old_keys=None, new_keys=None):
+    """Moves one printer between groups of the cached reports, if they are cached.
+    The get and set aren't atomic, so two concurrent updates can lose one of them;
+    REPORTS_CACHE_TIMEOUT bounds how long such a miscount lasts."""
+    key = reports_cache_key(today)
+    reports = cache.get(key)
+    if reports is None:
+        return
+    for keys, delta in ((old_keys, -1), (new_keys, 1)):
+        if keys is None:
+            continue
+        for name in REPORTS:
+            counts = reports[name]
+            counts[keys[name]] = counts.get(keys[name], 0) + delta
+            if counts[keys[name]] <= 0:
+                del counts[keys[name]]
+    cache.set(key, reports, settings.REPORTS_CACHE_TIMEOUT)
+
+@receiver(pre_save, sender=Printer)
+def remember_report_keys(sender, instance, **kwargs):
+    """Looks up the groups an edited printer is leaving, only when there are cached reports to update."""
+    instance._old_report_keys = None
+    if instance.pk is None or cache.get(reports_cache_key(date.today())) is None:
+        return
+    old = Printer.objects.filter(pk=instance.pk).only('brand', 'model', 'location', 'manufacture_date').first()
+    if old is not None:
+        instance._old_report_keys = report_keys(old, date.today())
+
+@receiver(post_save, sender=Printer)
+def printer_saved(sender, instance, **kwargs):
+    today = date.today()
+    old_keys = getattr(instance, '_old_report_keys', None)
+    new_keys = report_keys(instance, today)
+    transaction.on_commit(lambda: update_reports(today, old_keys, new_keys))
+
+@receiver(post_delete, sender=Printer)
+def printer_deleted(sender, instance, **kwargs):
+    today = date.today()
+    old_keys = report_keys(instance, today)
+    transaction.on_commit(lambda: update_reports(today, old_keys=old_keys))
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'app.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -64,6 +65,25 @@ MIDDLEWARE = [
 
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 
+# HTML responses smaller than this many bytes are not worth compressing
+COMPRESSION_MIN_SIZE = 1024
+
+# What to do when a saved printer reuses another printer's IP or MAC address: 'reject' or 'warn'
+PRINTER_ADDRESS_CONFLICTS = 'reject'
+
+# Seconds the fleet reports stay cached. Committed saves through the ORM update them in
+# place, the timeout bounds how stale they get with a per-process cache, bulk updates, or
+# two concurrent saves racing on the cached counts (the update isn't atomic).
+REPORTS_CACHE_TIMEOUT = 300
+
+# Token bucket for add/update/delete requests, per user: bursts of up to
+# WRITE_RATE_LIMIT_BURST writes, refilled at WRITE_RATE_LIMIT_PER_SECOND
+WRITE_RATE_LIMIT_BURST = 10
+WRITE_RATE_LIMIT_PER_SECOND = 1.0
+
+# Seconds a write request's idempotency key is remembered
+IDEMPOTENCY_KEY_TIMEOUT = 60 * 60
+
 ROOT_URLCONF = 'app.urls'
 
 # Template configuration
@@ -0,0 +1,17 @@
+"""
+Shared helpers for the tests.
+"""
+
+def printer_data(**overrides):
+    """Returns the fields of a valid printer submission, with any overrides applied."""
+    data = {
+        'brand': 'Test Brand',
+        'model': 'Test Model',
+        'location': 'Test Location',
+        'ip_address': '192.168.1.1',
+        'mac_address': '00:1A:2B:3C:4D:5E',
+        'manufacture_date': '2025-06-20',
+        'comments': 'Test comments',
+    }
+    data.update(overrides)
+    return data
@@ -8,8 +8,8 @@ from django.test import TestCase
 from django.urls import *
 from django.contrib.auth.models import User
 
-from .models import Printer 
-from .forms import BootstrapUserCreationForm
+from app.models import Printer
+from app.forms import BootstrapUserCreationForm
 from django.db import connection
 
 # run tests with: python manage.py test
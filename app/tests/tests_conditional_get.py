@@ -0,0 +1,150 @@
+"""
+Tests for conditional GET and compression of the home page.
+"""
+
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from app.middleware import brotli
+from app.models import Printer, PrinterChanges
+
+# run tests with: python manage.py test
+
+class HomeConditionalGetTests(TestCase):
+    def setUp(self):
+        self.test_user = User.objects.create_user(username='testuser', password='testpassword123')
+        self.printer = Printer.objects.create(
+            brand="Test Brand",
+            model="Test Model",
+            location="Test Location",
+            ip_address="192.168.1.1",
+            mac_address="00:1A:2B:3C:4D:5E",
+            manufacture_date="2025-06-20",
+            comments="Test comments"
+        )
+        self.client.login(username='testuser', password='testpassword123')
+
+    def test_home_sends_etag(self):
+        """The home page carries an ETag and must be revalidated by the browser."""
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_home_not_modified(self):
+        """A matching If-None-Match gets a 304 without a body."""
+        etag = self.client.get('/')['ETag']
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_etag_changes_on_edit(self):
+        """Editing a printer invalidates the ETag."""
+        etag = self.client.get('/')['ETag']
+        self.printer.location = 'New Location'
+        self.printer.save()
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_changes_on_delete_and_add(self):
+        """Replacing a printer with a new one invalidates the ETag."""
+        etag = self.client.get('/')['ETag']
+        self.printer.delete()
+        Printer.objects.create(brand="Other Brand")
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_is_per_user(self):
+        """Another user never gets a 304 for someone else's page."""
+        etag = self.client.get('/')['ETag']
+        User.objects.create_user(username='otheruser', password='testpassword123')
+        self.client.login(username='otheruser', password='testpassword123')
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_pending_messages_skip_etag(self):
+        """Flash messages are rendered instead of answering 304."""
+        etag = self.client.get('/')['ETag']
+        self.client.post('/add_printer/', {'brand': ''})
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_table_version(self):
+        """The table version changes with every save and delete."""
+        version = Printer.table_version()
+        self.printer.save()
+        self.assertNotEqual(Printer.table_version(), version)
+        version = Printer.table_version()
+        Printer.objects.filter(pk=self.printer.pk).delete()
+        self.assertNotEqual(Printer.table_version(), version)
+
+    def test_table_version_rolls_back(self):
+        """A rolled back change leaves the table version as it was."""
+        version = Printer.table_version()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.printer.save()
+            raise RuntimeError
+        self.assertEqual(Printer.table_version(), version)
+
+    def test_failed_bump_rolls_back_save(self):
+        """A printer change isn't kept if the change counter can't be bumped."""
+        with mock.patch.object(PrinterChanges, 'bump', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            Printer.objects.create(brand="Other Brand")
+        self.assertFalse(Printer.objects.filter(brand="Other Brand").exists())
+
+    def test_table_version_is_cheap(self):
+        """The table version takes two single-row queries whatever the number of printers."""
+        with self.assertNumQueries(2):
+            Printer.table_version()
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='testuser', password='testpassword123')
+        self.client.login(username='testuser', password='testpassword123')
+
+    def test_large_html_is_gzipped(self):
+        """The home page is compressed when the browser accepts gzip."""
+        response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_large_html_is_brotli_compressed(self):
+        """Brotli is preferred when the browser accepts it."""
+        response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertTrue(response['ETag'].startswith('W/'))
+        self.assertIn(b'Printers List', brotli.decompress(response.content))
+
+    def test_no_compression_without_accept_encoding(self):
+        """The home page is sent as is when the browser doesn't accept gzip."""
+        response = self.client.get('/')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 9)
+    def test_small_html_not_compressed(self):
+        """Responses under the threshold are sent as is."""
+        response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+class BenchHomePageCommandTests(TestCase):
+    def test_bench_home_page(self):
+        """The benchmark reports every encoding and leaves nothing behind."""
+        out = StringIO()
+        call_command('bench_home_page', printers=20, stdout=out)
+        self.assertIn('uncompressed', out.getvalue())
+        self.assertIn('gzip', out.getvalue())
+        self.assertIn('304 revalidation', out.getvalue())
+        self.assertFalse(Printer.objects.exists())
+        self.assertFalse(User.objects.exists())
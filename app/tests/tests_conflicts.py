@@ -0,0 +1,163 @@
+"""
+Tests for IP and MAC address conflict detection.
+"""
+
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from app.management.commands.find_conflicts import Command as FindConflictsCommand
+from app.models import (
+    PLACEHOLDER_IP,
+    PLACEHOLDER_MAC,
+    PLACEHOLDER_SUBNET,
+    Printer,
+    ip_subnet,
+    normalize_ip,
+    normalize_mac,
+)
+from app.tests.helpers import printer_data
+
+# run tests with: python manage.py test
+
+class NormalizeTests(TestCase):
+    def test_normalize_ip(self):
+        """IP addresses are stored in their canonical form."""
+        self.assertEqual(normalize_ip(' 192.168.1.1 '), '192.168.1.1')
+        self.assertEqual(normalize_ip('2001:DB8:0:0::1'), '2001:db8::1')
+        self.assertEqual(normalize_ip('Not An IP'), '')
+
+    def test_normalize_mac(self):
+        """MAC addresses compare equal whatever their case and separators."""
+        self.assertEqual(normalize_mac('00:1A:2B:3C:4D:5E'), '001a2b3c4d5e')
+        self.assertEqual(normalize_mac('00-1a-2b-3c-4d-5e'), '001a2b3c4d5e')
+        self.assertEqual(normalize_mac('001A.2B3C.4D5E'), '001a2b3c4d5e')
+        self.assertEqual(normalize_mac('N/A'), '')
+        self.assertEqual(normalize_mac('see label'), '')
+        self.assertEqual(normalize_mac('00:1A:2B:3C:4D'), '')
+
+    def test_ip_subnet(self):
+        """IP addresses are grouped into /24 and /64 subnets."""
+        self.assertEqual(ip_subnet('192.168.1.77'), '192.168.1.0/24')
+        self.assertEqual(ip_subnet('2001:db8::1'), '2001:db8::/64')
+        self.assertEqual(ip_subnet('Not An IP'), '')
+
+class ConflictTests(TestCase):
+    def setUp(self):
+        self.test_user = User.objects.create_user(username='testuser', password='testpassword123')
+        self.printer = Printer.objects.create(**printer_data())
+        self.client.login(username='testuser', password='testpassword123')
+
+    def new_printer_data(self, **overrides):
+        """Submission for a second printer, on addresses the first one doesn't use."""
+        return printer_data(**{'ip_address': '192.168.1.2', 'mac_address': '00:1A:2B:3C:4D:5F', **overrides})
+
+    def test_save_normalizes_addresses(self):
+        """Saving a printer fills in the normalized address columns."""
+        self.assertEqual(self.printer.ip_normalized, '192.168.1.1')
+        self.assertEqual(self.printer.mac_normalized, '001a2b3c4d5e')
+        self.assertEqual(self.printer.ip_subnet, '192.168.1.0/24')
+
+    def test_address_conflicts(self):
+        """Conflicts are found by IP or MAC address, excluding the printer itself."""
+        self.assertEqual(list(Printer.address_conflicts('192.168.1.1', '11:11:11:11:11:11')), [self.printer])
+        self.assertEqual(list(Printer.address_conflicts('10.0.0.1', '00-1a-2b-3c-4d-5e')), [self.printer])
+        self.assertFalse(Printer.address_conflicts('10.0.0.1', '11:11:11:11:11:11').exists())
+        self.assertFalse(Printer.address_conflicts('192.168.1.1', '00:1A:2B:3C:4D:5E', exclude_id=self.printer.id).exists())
+
+    def test_placeholders_never_conflict(self):
+        """The default addresses don't conflict with other printers still using them."""
+        placeholder = Printer.objects.create()
+        Printer.objects.create()
+        self.assertFalse(Printer.address_conflicts('0.0.0.0', '00:00:00:00:00:00').exists())
+        self.assertEqual(list(Printer.address_conflicts('0.0.0.0', '00-1a-2b-3c-4d-5e')), [self.printer])
+        self.client.post(f'/update_printer/{placeholder.id}/', self.new_printer_data(
+            ip_address='0.0.0.0', mac_address='00:00:00:00:00:00', location='Moved'))
+        self.assertEqual(Printer.objects.get(id=placeholder.id).location, 'Moved')
+
+    def test_add_printer_rejects_duplicate_ip(self):
+        """Adding a printer with a used IP address is rejected."""
+        self.client.post('/add_printer/', self.new_printer_data(ip_address='192.168.1.1'))
+        self.assertEqual(Printer.objects.count(), 1)
+
+    def test_add_printer_rejects_duplicate_mac(self):
+        """Adding a printer with a used MAC address is rejected."""
+        self.client.post('/add_printer/', self.new_printer_data(mac_address='00-1a-2b-3c-4d-5e'))
+        self.assertEqual(Printer.objects.count(), 1)
+
+    def test_add_printer_without_conflict(self):
+        """Adding a printer with unused addresses succeeds."""
+        self.client.post('/add_printer/', self.new_printer_data())
+        self.assertEqual(Printer.objects.count(), 2)
+
+    @override_settings(PRINTER_ADDRESS_CONFLICTS='warn')
+    def test_add_printer_warns_on_conflict(self):
+        """In warn mode the printer is saved anyway."""
+        response = self.client.post('/add_printer/', self.new_printer_data(ip_address='192.168.1.1'), follow=True)
+        self.assertEqual(Printer.objects.count(), 2)
+        self.assertContains(response, 'already used by')
+
+    def test_update_printer_keeps_own_addresses(self):
+        """A printer doesn't conflict with itself when edited."""
+        self.client.post(f'/update_printer/{self.printer.id}/', self.new_printer_data(
+            ip_address='192.168.1.1', mac_address='00:1A:2B:3C:4D:5E', location='Moved'))
+        self.assertEqual(Printer.objects.get(id=self.printer.id).location, 'Moved')
+
+    def test_update_printer_rejects_conflict(self):
+        """Editing a printer to use another printer's address is rejected."""
+        other = Printer.objects.create(ip_address='192.168.1.2', mac_address='00:1A:2B:3C:4D:5F')
+        self.client.post(f'/update_printer/{other.id}/', self.new_printer_data(ip_address='192.168.1.1'))
+        self.assertEqual(Printer.objects.get(id=other.id).ip_address, '192.168.1.2')
+
+class FindConflictsCommandTests(TestCase):
+    def setUp(self):
+        self.first = Printer.objects.create(ip_address='192.168.1.1', mac_address='00:1A:2B:3C:4D:5E')
+        self.second = Printer.objects.create(ip_address='192.168.1.1', mac_address='00:1A:2B:3C:4D:5F')
+        self.third = Printer.objects.create(ip_address='192.168.1.9', mac_address='00-1a-2b-3c-4d-5f')
+        self.fourth = Printer.objects.create(ip_address='10.0.0.1', mac_address='00:00:00:00:00:01')
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('find_conflicts', *args, stdout=out)
+        return out.getvalue()
+
+    def test_shared_groups(self):
+        """Each report lists only the printers sharing a value."""
+        command = FindConflictsCommand()
+        self.assertEqual(list(command.shared('ip_normalized', PLACEHOLDER_IP)), [self.first, self.second])
+        self.assertEqual(list(command.shared('mac_normalized', PLACEHOLDER_MAC)), [self.second, self.third])
+        self.assertEqual(list(command.shared('ip_subnet', PLACEHOLDER_SUBNET)), [self.first, self.second, self.third])
+
+    def test_legacy_free_text_is_not_reported(self):
+        """Free text left in the address columns by older versions isn't reported as duplicates."""
+        legacy = [Printer.objects.create(ip_address='N/A', mac_address='N/A') for _ in range(2)]
+        self.assertFalse(Printer.address_conflicts('N/A', 'N/A').exists())
+        # What earlier versions stored for these rows
+        Printer.objects.filter(id__in=[printer.id for printer in legacy]).update(ip_normalized='n/a', mac_normalized='a')
+        output = self.run_command('--refresh')
+        for printer in legacy:
+            self.assertNotIn(f'#{printer.id} ', output)
+
+    def test_placeholders_are_not_reported(self):
+        """Printers still on the default addresses aren't reported as sharing them."""
+        Printer.objects.create()
+        Printer.objects.create()
+        output = self.run_command()
+        self.assertNotIn('0.0.0.0', output)
+        self.assertNotIn('000000000000', output)
+
+    def test_report(self):
+        """The report prints every group."""
+        output = self.run_command()
+        self.assertIn('192.168.1.1\n', output)
+        self.assertIn('001a2b3c4d5f', output)
+        self.assertIn('192.168.1.0/24', output)
+        self.assertNotIn('10.0.0.1', output)
+
+    def test_refresh(self):
+        """--refresh fills in normalized columns of rows saved without them."""
+        Printer.objects.filter(id=self.fourth.id).update(ip_address='192.168.1.1', ip_normalized='', ip_subnet='')
+        output = self.run_command('--refresh')
+        self.assertIn(f'#{self.fourth.id} ', output)
@@ -0,0 +1,112 @@
+"""
+Tests for the fleet reports.
+"""
+
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+
+from app.models import Printer
+from app.reports import age_band, compute_reports, get_reports
+
+# run tests with: python manage.py test
+
+TODAY = date(2026, 10, 19)
+
+class AgeBandTests(TestCase):
+    def test_age_band(self):
+        """Manufacture dates fall into the expected bands."""
+        self.assertEqual(age_band('2026-01-01', TODAY), 'Under 1 year')
+        self.assertEqual(age_band('2024-10-19', TODAY), '1-3 years')
+        self.assertEqual(age_band('2022-06-01', TODAY), '3-5 years')
+        self.assertEqual(age_band('2016-10-20', TODAY), '5-10 years')
+        self.assertEqual(age_band('2001-01-01', TODAY), '10+ years')
+        self.assertEqual(age_band('1999-12-31', TODAY), '10+ years')
+        self.assertEqual(age_band('1900-00-00', TODAY), 'Unknown')
+        self.assertEqual(age_band('June 2020', TODAY), 'Unknown')
+
+    def test_age_band_matches_database(self):
+        """The Python age band agrees with the database expression."""
+        dates = ['2026-01-01', '2025-10-19', '2024-10-19', '2022-06-01', '2016-10-20', '2001-01-01', '1900-00-00', 'June 2020']
+        for manufacture_date in dates:
+            Printer.objects.create(manufacture_date=manufacture_date)
+        expected = {}
+        for manufacture_date in dates:
+            band = age_band(manufacture_date, TODAY)
+            expected[band] = expected.get(band, 0) + 1
+        self.assertEqual(compute_reports(TODAY)['age_band'], expected)
+
+class ReportsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        User.objects.create_user(username='testuser', password='testpassword123')
+        self.client.login(username='testuser', password='testpassword123')
+        self.printer = Printer.objects.create(brand='HP', model='LaserJet', location='Office', manufacture_date='2025-06-20')
+        Printer.objects.create(brand='HP', model='OfficeJet', location='Office', manufacture_date='2010-01-01')
+        Printer.objects.create(brand='Canon', model='Pixma', location='Lab', manufacture_date='2025-06-21')
+
+    def test_compute_reports(self):
+        """Each report counts printers per key."""
+        reports = compute_reports(TODAY)
+        self.assertEqual(reports['brand'], {'HP': 2, 'Canon': 1})
+        self.assertEqual(reports['model'], {'LaserJet': 1, 'OfficeJet': 1, 'Pixma': 1})
+        self.assertEqual(reports['location'], {'Office': 2, 'Lab': 1})
+        self.assertEqual(reports['age_band'], {'1-3 years': 2, '10+ years': 1})
+
+    def test_reports_are_cached(self):
+        """A second call doesn't query the database."""
+        get_reports()
+        with self.assertNumQueries(0):
+            get_reports()
+
+    def test_cached_reports_follow_edits(self):
+        """Adding, editing and deleting printers updates the cached counts."""
+        get_reports()
+        with self.captureOnCommitCallbacks(execute=True):
+            Printer.objects.create(brand='Canon', model='Pixma', location='Lab', manufacture_date='2025-06-22')
+            self.printer.brand = 'Brother'
+            self.printer.save()
+            Printer.objects.filter(model='OfficeJet').get().delete()
+        with self.assertNumQueries(0):
+            reports = get_reports()
+        self.assertEqual(reports, compute_reports(date.today()))
+        self.assertEqual(reports['brand'], {'Brother': 1, 'Canon': 2})
+
+    def test_rolled_back_changes_leave_cache(self):
+        """Changes that are rolled back never reach the cached counts."""
+        get_reports()
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError), transaction.atomic():
+            Printer.objects.create(brand='Zebra')
+            self.printer.delete()
+            raise RuntimeError
+        self.assertEqual(get_reports(), compute_reports(date.today()))
+        self.assertEqual(get_reports()['brand'], {'HP': 2, 'Canon': 1})
+
+    def test_placeholder_date_is_unknown(self):
+        """Printers on the default manufacture date are counted as unknown, not old."""
+        Printer.objects.create()
+        self.assertEqual(compute_reports(TODAY)['age_band'], {'1-3 years': 2, '10+ years': 1, 'Unknown': 1})
+
+    def test_reports_page(self):
+        """The reports page lists every group."""
+        response = self.client.get('/reports/')
+        self.assertContains(response, 'Reports - Printer Management', 1, 200)
+        self.assertContains(response, 'Canon')
+        self.assertContains(response, 'Lab')
+
+    def test_reports_json(self):
+        """The JSON endpoint returns the same figures."""
+        response = self.client.get('/reports/json/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total'], 3)
+        self.assertEqual(response.json()['reports']['location'], {'Office': 2, 'Lab': 1})
+
+    def test_reports_require_login(self):
+        """Reports redirect to the login page when logged out."""
+        self.client.logout()
+        self.assertEqual(self.client.get('/reports/').status_code, 302)
+        self.assertEqual(self.client.get('/reports/json/').status_code, 302)
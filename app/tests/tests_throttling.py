@@ -0,0 +1,111 @@
+"""
+Tests for rate limiting and idempotency keys on the write endpoints.
+"""
+
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from app.models import Printer
+from app.tests.helpers import printer_data
+from app.throttling import get_metrics
+
+# run tests with: python manage.py test
+
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.test_user = User.objects.create_user(username='testuser', password='testpassword123')
+        self.test_adminuser = User.objects.create_superuser('testadminuser', 'admin@example.com', 'testadminpassword123')
+        self.client.login(username='testuser', password='testpassword123')
+
+    def add_printer(self, index, **extra):
+        return self.client.post('/add_printer/', printer_data(
+            ip_address=f'192.168.1.{index}', mac_address=f'00:1A:2B:3C:4D:{index:02X}'), **extra)
+
+    @override_settings(WRITE_RATE_LIMIT_BURST=3, WRITE_RATE_LIMIT_PER_SECOND=0.001)
+    def test_rate_limit(self):
+        """Writes beyond the burst get a 429 and don't reach the database."""
+        for index in range(3):
+            self.assertEqual(self.add_printer(index).status_code, 302)
+        response = self.add_printer(3)
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(response.has_header('Retry-After'))
+        self.assertEqual(Printer.objects.count(), 3)
+        self.assertEqual(get_metrics()['rejected'], 1)
+
+    @override_settings(WRITE_RATE_LIMIT_BURST=1, WRITE_RATE_LIMIT_PER_SECOND=20)
+    def test_retry_after_rate_limit(self):
+        """A request rejected by the rate limit can be retried with the same key once tokens refill."""
+        self.assertEqual(self.add_printer(1, HTTP_IDEMPOTENCY_KEY='first').status_code, 302)
+        self.assertEqual(self.add_printer(2, HTTP_IDEMPOTENCY_KEY='second').status_code, 429)
+        time.sleep(0.1)
+        self.assertEqual(self.add_printer(2, HTTP_IDEMPOTENCY_KEY='second').status_code, 302)
+        self.assertEqual(Printer.objects.count(), 2)
+        self.assertEqual(get_metrics(), {'rejected': 1, 'coalesced': 0})
+
+    @override_settings(WRITE_RATE_LIMIT_BURST=1, WRITE_RATE_LIMIT_PER_SECOND=0.001)
+    def test_rate_limit_is_per_user(self):
+        """Each user has their own bucket."""
+        self.assertEqual(self.add_printer(1).status_code, 302)
+        self.client.login(username='testadminuser', password='testadminpassword123')
+        self.assertEqual(self.add_printer(2).status_code, 302)
+        self.assertEqual(self.add_printer(3).status_code, 429)
+
+    def test_idempotency_key_form_field(self):
+        """Replaying a form with the same key adds a single printer."""
+        data = printer_data(idempotency_key='abc')
+        first = self.client.post('/add_printer/', data)
+        second = self.client.post('/add_printer/', data)
+        self.assertEqual(Printer.objects.count(), 1)
+        self.assertEqual(second.status_code, first.status_code)
+        self.assertEqual(second['Location'], first['Location'])
+        self.assertEqual(get_metrics()['coalesced'], 1)
+
+    def test_idempotency_key_reused_for_other_request(self):
+        """A key sent again with different values gets a 422 instead of the first response."""
+        self.client.post('/add_printer/', printer_data(idempotency_key='abc'))
+        response = self.client.post('/add_printer/', printer_data(idempotency_key='abc', location='Other Location'))
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(list(Printer.objects.values_list('location', flat=True)), ['Test Location'])
+        self.assertEqual(get_metrics()['coalesced'], 0)
+
+    def test_idempotency_ignores_csrf_token(self):
+        """A resubmitted form is still coalesced when only its CSRF token changed."""
+        self.client.post('/add_printer/', printer_data(idempotency_key='abc', csrfmiddlewaretoken='first'))
+        response = self.client.post('/add_printer/', printer_data(idempotency_key='abc', csrfmiddlewaretoken='second'))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Printer.objects.count(), 1)
+        self.assertEqual(get_metrics()['coalesced'], 1)
+
+    def test_idempotency_key_header(self):
+        """Replaying a delete with the same header is coalesced."""
+        printer = Printer.objects.create(**printer_data())
+        self.client.login(username='testadminuser', password='testadminpassword123')
+        self.client.post(f'/delete_printer/{printer.id}/', HTTP_IDEMPOTENCY_KEY='abc')
+        response = self.client.post(f'/delete_printer/{printer.id}/', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(get_metrics()['coalesced'], 1)
+
+    def test_different_keys_are_not_coalesced(self):
+        """Distinct keys are separate requests."""
+        self.add_printer(1, HTTP_IDEMPOTENCY_KEY='first')
+        self.add_printer(2, HTTP_IDEMPOTENCY_KEY='second')
+        self.assertEqual(Printer.objects.count(), 2)
+        self.assertEqual(get_metrics()['coalesced'], 0)
+
+    def test_replays_skip_database(self):
+        """A replayed request doesn't query the database beyond loading the session."""
+        self.add_printer(1, HTTP_IDEMPOTENCY_KEY='abc')
+        with self.assertNumQueries(2):  # session and user
+            self.add_printer(1, HTTP_IDEMPOTENCY_KEY='abc')
+
+    def test_write_metrics_staff_only(self):
+        """Only staff can read the write metrics."""
+        self.assertEqual(self.client.get('/metrics/writes/').status_code, 403)
+        self.client.login(username='testadminuser', password='testadminpassword123')
+        response = self.client.get('/metrics/writes/')
+        self.assertEqual(response.json(), {'rejected': 0, 'coalesced': 0})
@@ -0,0 +1,101 @@
+"""
+Tests for printer input validation.
+"""
+
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+
+from app.models import Printer
+from app.tests.helpers import printer_data
+from app.validators import (
+    clean_ip_address,
+    clean_mac_address,
+    clean_manufacture_date,
+    clean_printer,
+    clean_printers,
+)
+
+# run tests with: python manage.py test
+
+class ValidatorTests(TestCase):
+    def test_ip_address(self):
+        """IPv4 and IPv6 addresses are accepted, anything else is rejected."""
+        for value in ['192.168.1.1', '0.0.0.0', '255.255.255.255', '2001:db8::1', '::ffff:10.0.0.1']:
+            self.assertEqual(clean_ip_address(value), value)
+        for value in ['256.1.1.1', '192.168.1', '192.168.01.1', 'printer', '2001:db8:::1']:
+            with self.assertRaisesMessage(ValidationError, f"Invalid IP address - {value}"):
+                clean_ip_address(value)
+
+    def test_mac_address(self):
+        """MAC addresses are accepted with colons, dashes, dots or no separators."""
+        for value in ['00:1A:2B:3C:4D:5E', '00-1a-2b-3c-4d-5e', '001A.2B3C.4D5E', '001A2B3C4D5E']:
+            self.assertEqual(clean_mac_address(value), value)
+        for value in ['00:1A:2B:3C:4D', '00:1A-2B:3C:4D:5E', '00:1A:2B:3C:4D:5G', 'printer']:
+            with self.assertRaisesMessage(ValidationError, f"Invalid MAC address - {value}"):
+                clean_mac_address(value)
+
+    def test_manufacture_date(self):
+        """ISO dates take the fast path, other formats fall back to dateutil."""
+        self.assertEqual(clean_manufacture_date('2025-06-20'), '2025-06-20')
+        self.assertEqual(clean_manufacture_date('20 June 2025'), '2025-06-20')
+        self.assertEqual(clean_manufacture_date('2025/06/20'), '2025-06-20')
+        for value in ['2025-13-45', 'not a date']:
+            with self.assertRaisesMessage(ValidationError, f"Invalid date format - {value}"):
+                clean_manufacture_date(value)
+
+    def test_clean_printer(self):
+        """A valid printer comes back with its date normalized."""
+        cleaned = clean_printer(printer_data(manufacture_date='20 June 2025'))
+        self.assertEqual(cleaned, printer_data())
+
+    def test_clean_printer_required_fields(self):
+        """Blank required fields are reported by name."""
+        with self.assertRaisesMessage(ValidationError, "Field 'location' cannot be empty."):
+            clean_printer(printer_data(location='  '))
+        with self.assertRaisesMessage(ValidationError, "Field 'brand' cannot be empty."):
+            clean_printer({})
+
+    def test_clean_printers(self):
+        """Batches return the valid rows and the index of each rejected one."""
+        rows = [printer_data(), printer_data(ip_address='bad'), printer_data(model='')]
+        cleaned, errors = clean_printers(rows)
+        self.assertEqual(cleaned, [printer_data()])
+        self.assertEqual(errors, [(1, "Invalid IP address - bad"), (2, "Field 'model' cannot be empty.")])
+
+class ValidatedViewTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='testuser', password='testpassword123')
+        self.client.login(username='testuser', password='testpassword123')
+
+    def test_add_printer_normalizes_date(self):
+        """add_printer stores the manufacture date as YYYY-MM-DD."""
+        self.client.post('/add_printer/', printer_data(manufacture_date='June 20, 2025'))
+        self.assertEqual(Printer.objects.get().manufacture_date, '2025-06-20')
+
+    def test_add_printer_rejects_invalid_mac(self):
+        """add_printer flashes the validation error and saves nothing."""
+        response = self.client.post('/add_printer/', printer_data(mac_address='nope'), follow=True)
+        self.assertFalse(Printer.objects.exists())
+        self.assertContains(response, 'Invalid MAC address - nope')
+
+    def test_update_printer_rejects_invalid_ip(self):
+        """update_printer leaves the printer unchanged on invalid input."""
+        printer = Printer.objects.create(**printer_data())
+        self.client.post(f'/update_printer/{printer.id}/', printer_data(ip_address='300.1.1.1', location='Moved'))
+        self.assertEqual(Printer.objects.get(id=printer.id).location, 'Test Location')
+
+class BenchValidationCommandTests(TestCase):
+    def test_bench_validation(self):
+        """The benchmark times both validation paths, which reject the same rows."""
+        out = StringIO()
+        call_command('bench_validation', rows=40, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], 'Validating 40 rows:')
+        self.assertIn('inline checks', lines[1])
+        self.assertIn('clean_printers', lines[2])
+        self.assertTrue(lines[1].endswith('2 rejected'))
+        self.assertTrue(lines[2].endswith('2 rejected'))
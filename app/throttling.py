@@ -0,0 +1,114 @@
+"""
+Rate limiting and request coalescing for the write endpoints.
+
+State lives in the default cache. With the local-memory cache each process
+keeps its own buckets and keys, which is enough to stop a retrying script or
+a double-clicked button from reaching the database.
+"""
+
+import hashlib
+import json
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import redirect
+
+METRICS = ('rejected', 'coalesced')
+
+# Form fields that differ between submissions of the same request
+UNSIGNED_FIELDS = ('csrfmiddlewaretoken', 'idempotency_key')
+
+def client_id(request):
+    """Identifies the user behind a request, falling back to the address for anonymous requests."""
+    if request.user.is_authenticated:
+        return f'user-{request.user.pk}'
+    return f"addr-{request.META.get('REMOTE_ADDR', '')}"
+
+def count(metric):
+    key = f'write-metrics-{metric}'
+    cache.add(key, 0, None)
+    cache.incr(key)
+
+def get_metrics():
+    """Returns how many write requests were rejected by the rate limit or coalesced by idempotency key."""
+    return {metric: cache.get(f'write-metrics-{metric}', 0) for metric in METRICS}
+
+def payload_digest(request):
+    """Returns a hash of the submitted form, so a key reused for a different request can be told apart."""
+    fields = sorted((name, values) for name, values in request.POST.lists() if name not in UNSIGNED_FIELDS)
+    return hashlib.sha256(json.dumps(fields).encode()).hexdigest()
+
+def take_token(client):
+    """Takes a token from the client's bucket.
+    Returns None on success, or the seconds until the next token otherwise."""
+    burst = settings.WRITE_RATE_LIMIT_BURST
+    rate = settings.WRITE_RATE_LIMIT_PER_SECOND
+    key = f'write-bucket-{client}'
+    now = time.time()
+    tokens, updated = cache.get(key, (burst, now))
+    tokens = min(burst, tokens + (now - updated) * rate)
+    if tokens < 1:
+        cache.set(key, (tokens, now), burst / rate)
+        return (1 - tokens) / rate
+    cache.set(key, (tokens - 1, now), burst / rate)
+    return None
+
+def rate_limit(view):
+    """Answers 429 once the client has used up its token bucket of writes."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        retry_after = take_token(client_id(request))
+        if retry_after is not None:
+            count('rejected')
+            response = HttpResponse("Too many requests, please try again shortly.", status=429, content_type='text/plain')
+            response['Retry-After'] = str(int(retry_after) + 1)
+            return response
+        return view(request, *args, **kwargs)
+    return wrapper
+
+def idempotent(view):
+    """Runs a request at most once per idempotency key.
+    The key comes from the Idempotency-Key header or the idempotency_key form field.
+    Replays get the first response back, or a redirect home while the first one is still running.
+    A key reused with a different form gets a 422 instead, as replaying would drop the new values.
+    Rate limited (429) and server error responses aren't kept, so a retry with the same key runs again."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        idempotency_key = request.headers.get('Idempotency-Key') or request.POST.get('idempotency_key')
+        if not idempotency_key:
+            return view(request, *args, **kwargs)
+
+        key = f'write-idempotency-{client_id(request)}-{request.path}-{idempotency_key}'
+        payload = payload_digest(request)
+        if not cache.add(key, {'payload': payload}, settings.IDEMPOTENCY_KEY_TIMEOUT):
+            first = cache.get(key)
+            if first is not None and first['payload'] != payload:
+                return HttpResponse("This idempotency key was already used for a different request.",
+                                    status=422, content_type='text/plain')
+            count('coalesced')
+            if first is None or 'status' not in first:
+                return redirect('/')
+            response = HttpResponse(first['content'], status=first['status'])
+            for header, value in first['headers'].items():
+                response[header] = value
+            return response
+
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            cache.delete(key)
+            raise
+        if response.status_code == 429 or response.status_code >= 500:
+            cache.delete(key)
+            return response
+        cache.set(key, {
+            'payload': payload,
+            'status': response.status_code,
+            'content': response.content,
+            'headers': {header: response[header] for header in ('Content-Type', 'Location') if response.has_header(header)},
+        }, settings.IDEMPOTENCY_KEY_TIMEOUT)
+        return response
+    return wrapper
@@ -30,4 +30,7 @@ urlpatterns = [
     path('update_printer/<printer_id>/', views.update_printer, name='update_printer'),
     path('add_printer/', views.add_printer, name='add_printer'),
     path('delete_printer/<printer_id>/', views.delete_printer, name='delete_printer'),
+    path('reports/', views.reports, name='reports'),
+    path('reports/json/', views.reports_json, name='reports_json'),
+    path('metrics/writes/', views.write_metrics, name='write_metrics'),
 ]
@@ -0,0 +1,81 @@
+"""
+Definition of validators.
+"""
+
+import re
+from datetime import date
+
+from dateutil import parser
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_ipv46_address
+
+REQUIRED_FIELDS = ('brand', 'model', 'location', 'ip_address', 'mac_address', 'manufacture_date')
+
+_octet = r'(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+re_ipv4 = re.compile(rf'{_octet}(?:\.{_octet}){{3}}')
+re_mac = re.compile(
+    r'[0-9A-Fa-f]{2}([:-])(?:[0-9A-Fa-f]{2}\1){4}[0-9A-Fa-f]{2}'  # 00:1A:2B:3C:4D:5E or 00-1A-2B-3C-4D-5E
+    r'|[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}'            # 001A.2B3C.4D5E
+    r'|[0-9A-Fa-f]{12}'                                             # 001A2B3C4D5E
+)
+ISO_DATE_PATTERN = r'[0-9]{4}-[0-9]{2}-[0-9]{2}'
+re_iso_date = re.compile(ISO_DATE_PATTERN)
+
+def clean_ip_address(value):
+    """Validates an IPv4 or IPv6 address. Plain IPv4 addresses are checked by a regex alone."""
+    if re_ipv4.fullmatch(value):
+        return value
+    try:
+        validate_ipv46_address(value)
+    except ValidationError:
+        raise ValidationError(f"Invalid IP address - {value}", code='invalid_ip')
+    return value
+
+def clean_mac_address(value):
+    """Validates a MAC address written with colons, dashes, dots or no separators."""
+    if not re_mac.fullmatch(value):
+        raise ValidationError(f"Invalid MAC address - {value}", code='invalid_mac')
+    return value
+
+def clean_manufacture_date(value):
+    """Returns a manufacture date as YYYY-MM-DD.
+    ISO dates are parsed directly, dateutil is only used for other formats."""
+    if re_iso_date.fullmatch(value):
+        try:
+            return date.fromisoformat(value).isoformat()
+        except ValueError:
+            pass
+    try:
+        return parser.parse(value).date().isoformat()
+    except (ValueError, TypeError, OverflowError):
+        raise ValidationError(f"Invalid date format - {value}", code='invalid_date')
+
+def clean_printer(data):
+    """Validates a submitted printer and returns its cleaned fields.
+    Raises ValidationError with the first problem found."""
+    for field in REQUIRED_FIELDS:
+        value = data.get(field)
+        if not value or value.strip() == '':
+            raise ValidationError(f"Field '{field}' cannot be empty.", code='required')
+
+    return {
+        'brand': data['brand'],
+        'model': data['model'],
+        'location': data['location'],
+        'ip_address': clean_ip_address(data['ip_address']),
+        'mac_address': clean_mac_address(data['mac_address']),
+        'manufacture_date': clean_manufacture_date(data['manufacture_date']),
+        'comments': data.get('comments', ''),
+    }
+
+def clean_printers(rows):
+    """Validates many printers at once, e.g. for imports.
+    Returns the cleaned rows and a list of (row index, error message) for the rejected ones."""
+    cleaned = []
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            cleaned.append(clean_printer(row))
+        except ValidationError as error:
+            errors.append((index, error.message))
+    return cleaned, errors
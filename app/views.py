@@ -3,18 +3,22 @@ Definition of views.
 """
 
 from datetime import datetime
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, permission_required
-from django.http import HttpRequest, HttpResponseBadRequest
+from django.http import HttpRequest, HttpResponseBadRequest, JsonResponse
 from .models import Printer  # Import the Printer model
 from django.contrib.auth.models import User
 from django.contrib.auth import login as auth_login
 from .forms import BootstrapAuthenticationForm, BootstrapUserCreationForm
-from dateutil import parser
+from .validators import clean_printer
+from .reports import get_reports
+from .throttling import get_metrics, idempotent, rate_limit
 from django.core.exceptions import PermissionDenied
 from django.contrib import messages
-from django.core.validators import validate_ipv46_address
 from django.core.exceptions import ValidationError
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
 def login(request):
     """Renders the login page."""
@@ -27,7 +31,17 @@ def login(request):
             'year':datetime.now().year,
         }
     )
+def home_etag(request):
+    """Returns the ETag of the home page, or None when it has to be rendered fresh."""
+    # Pending flash messages are shown once, so the page can't come from the browser cache.
+    if messages.get_messages(request):
+        return None
+    last_login = request.user.last_login.timestamp() if request.user.last_login else 0
+    return f'"{request.user.pk}-{last_login}-{datetime.now().year}-{Printer.table_version()}"'
+
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=home_etag)
 def home(request):
     """Renders the home page."""
     assert isinstance(request, HttpRequest)
@@ -42,6 +56,48 @@ def home(request):
             'printers': printers,
         }
     )
+REPORT_TITLES = [
+    ('brand', 'Printers by brand'),
+    ('model', 'Printers by model'),
+    ('location', 'Printers by location'),
+    ('age_band', 'Printers by age'),
+]
+
+@login_required
+def reports(request):
+    """Renders the fleet reports page."""
+    assert isinstance(request, HttpRequest)
+    fleet_reports = get_reports()
+    return render(
+        request,
+        'app/reports.html',
+        {
+            'title':'Reports',
+            'year':datetime.now().year,
+            'total': sum(fleet_reports['brand'].values()),
+            'reports': [
+                (title, sorted(fleet_reports[name].items(), key=lambda item: (-item[1], item[0])))
+                for name, title in REPORT_TITLES
+            ],
+        }
+    )
+
+@login_required
+def reports_json(request):
+    """Returns the fleet reports as JSON."""
+    fleet_reports = get_reports()
+    return JsonResponse({
+        'total': sum(fleet_reports['brand'].values()),
+        'reports': fleet_reports,
+    })
+
+@login_required
+def write_metrics(request):
+    """Returns how many write requests were rate limited or coalesced, for staff only."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return JsonResponse(get_metrics())
+
 def register(request):
     """Renders the register page and handles user registration."""
     assert isinstance(request, HttpRequest)
@@ -63,6 +119,20 @@ def register(request):
         }
     )
 
+def check_address_conflicts(request, ip_address, mac_address, printer_id=None):
+    """Flashes any printers already using the addresses, returns True if the save must be rejected."""
+    conflicts = list(Printer.address_conflicts(ip_address, mac_address, exclude_id=printer_id)[:5])
+    if not conflicts:
+        return False
+    used_by = ', '.join(f"#{conflict.id} {conflict}" for conflict in conflicts)
+    if settings.PRINTER_ADDRESS_CONFLICTS == 'warn':
+        messages.warning(request, f"IP or MAC address already used by {used_by}")
+        return False
+    messages.error(request, f"IP or MAC address already used by {used_by}")
+    return True
+
+@idempotent
+@rate_limit
 def update_printer(request,printer_id):
     printer = get_object_or_404(Printer, pk=printer_id)
     try:
@@ -73,68 +143,37 @@ def update_printer(request,printer_id):
             'error_message': "Printer not found.",
         })
     else:
-        brand = request.POST['brand']
-        model = request.POST['model']
-        location = request.POST['location']
-        ip_address = request.POST['ip_address']
-        mac_address = request.POST['mac_address']
-
-        required_fields = ['brand', 'model', 'location', 'ip_address', 'mac_address', 'manufacture_date']
-        for field in required_fields:
-            if not request.POST.get(field) or request.POST.get(field).strip() == '':
-                messages.error(request, f"Field '{field}' cannot be empty.")
-                return redirect('/')
-
         try:
-            validate_ipv46_address(ip_address)
-        except ValidationError:
-            messages.error(request, f"Invalid IP address - {ip_address}")
+            cleaned = clean_printer(request.POST)
+        except ValidationError as error:
+            messages.error(request, error.message)
             return redirect('/')
 
-        try:
-            manufacture_date = parser.parse(request.POST['manufacture_date']).date()
-        except (ValueError, TypeError):
-            messages.error(request,f"Invalid date format - {request.POST['manufacture_date']}")
+        if check_address_conflicts(request, cleaned['ip_address'], cleaned['mac_address'], printer_id=printer_id):
             return redirect('/')
-        
-        comments = request.POST['comments']
-        
-        printer.editPrinter(id=printer_id, brand=brand, model=model, location=location, ip_address=ip_address, mac_address=mac_address, manufacture_date=manufacture_date, comments=comments)
+
+        printer.editPrinter(id=printer_id, **cleaned)
 
         return redirect('/')
 
+@idempotent
+@rate_limit
 def add_printer(request):
-    required_fields = ['brand', 'model', 'location', 'ip_address', 'mac_address', 'manufacture_date']
-    for field in required_fields:
-        if not request.POST.get(field) or request.POST.get(field).strip() == '':
-            messages.error(request, f"Field '{field}' cannot be empty.")
-            return redirect('/')
-
     try:
-        validate_ipv46_address(request.POST['ip_address'])
-    except ValidationError:
-        messages.error(request, f"Invalid IP address - {request.POST['ip_address']}")
+        cleaned = clean_printer(request.POST)
+    except ValidationError as error:
+        messages.error(request, error.message)
         return redirect('/')
 
-    try:
-        manufacture_date = parser.parse(request.POST['manufacture_date']).date()
-        manufacture_date_str = manufacture_date.strftime('%Y-%m-%d')  # Convert to string
-    except (ValueError, TypeError):
-        messages.error(request, f"Invalid date format - {request.POST['manufacture_date']}")
+    if check_address_conflicts(request, cleaned['ip_address'], cleaned['mac_address']):
         return redirect('/')
 
-    printer = Printer(
-        brand=request.POST['brand'],
-        model=request.POST['model'],
-        location=request.POST['location'],
-        ip_address=request.POST['ip_address'],
-        mac_address=request.POST['mac_address'],
-        manufacture_date=manufacture_date_str,
-        comments=request.POST['comments']
-    )
+    printer = Printer(**cleaned)
     printer.save()
     return redirect('/')
 
+@idempotent
+@rate_limit
 def delete_printer(request, printer_id):
     # Manually check if the user has the required permission
     if not request.user.has_perm('app.delete_printer'):